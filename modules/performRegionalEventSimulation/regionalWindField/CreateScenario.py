@@ -42,8 +42,49 @@ import os
 import subprocess
 import json
 import random
+import functools
 import numpy as np
 import pandas as pd
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def load_terrain(terrain_path):
+
+    # orjson (if installed) parses large terrain geojson files several times
+    # faster than the standard json module
+    if orjson is not None:
+        with open(terrain_path, 'rb') as f:
+            terrain_data = orjson.loads(f.read())
+    else:
+        with open(terrain_path) as f:
+            terrain_data = json.load(f)
+    # return
+    return terrain_data
+
+@functools.lru_cache(maxsize=1)
+def load_hist_storm_database(csv_path):
+
+    # The parsed database is cached next to the csv file (re-parsing the
+    # multi-header IBTrACS csv dominates the SimulationHist start-up time)
+    # and memoized in-process; callers must not modify the returned frame
+    cache_path = os.path.splitext(csv_path)[0] + '.pkl'
+    if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(csv_path):
+        try:
+            return pd.read_pickle(cache_path)
+        except Exception:
+            print('CreateScenario: warning - cached storm database is not readable, re-parsing the csv file.')
+    df_hs = pd.read_csv(csv_path, header = [0,1], index_col = None)
+    # Indexing by storm name and year (the sort is stable so that the track
+    # records of each storm stay in chronological order)
+    df_hs = df_hs.set_index([('NAME', ' '), ('SEASON', 'Year')], drop = False).sort_index(kind = 'stable')
+    try:
+        df_hs.to_pickle(cache_path)
+    except OSError:
+        print('CreateScenario: warning - cannot cache the storm database in {}.'.format(os.path.dirname(cache_path)))
+    # return
+    return df_hs
 
 def create_wind_scenarios(scenario_info, event_info, stations, data_dir):
 
@@ -52,15 +93,11 @@ def create_wind_scenarios(scenario_info, event_info, stations, data_dir):
     # Directly defining earthquake ruptures
     if scenario_info['Generator'] == 'Simulation':
         # Collecting site locations
-        lat = []
-        lon = []
-        for s in stations['Stations']:
-            lat.append(s['Latitude'])
-            lon.append(s['Longitude'])
+        df_st = pd.DataFrame.from_records(stations['Stations'], columns = ['Latitude', 'Longitude'])
         # Station list
         station_list = {
-            'Latitude': lat,
-            'Longitude': lon
+            'Latitude': df_st['Latitude'].tolist(),
+            'Longitude': df_st['Longitude'].tolist()
         }
         # Track data
         try:
@@ -70,8 +107,9 @@ def create_wind_scenarios(scenario_info, event_info, stations, data_dir):
                 'Latitude': df.iloc[:, 0].values.tolist(),
                 'Longitude': df.iloc[:, 1].values.tolist()
             }
-        except:
+        except (KeyError, TypeError, IndexError, OSError, ValueError):
             print('CreateScenario: error - no storm track provided or file format not accepted.')
+            return 1
         # Save Lat_w.csv
         track_simu_file = scenario_info['Storm'].get('TrackSimu', None)
         if track_simu_file:         
@@ -82,8 +120,7 @@ def create_wind_scenarios(scenario_info, event_info, stations, data_dir):
         # Reading Terrain info (if provided)
         terrain_file = scenario_info.get('Terrain', None)
         if terrain_file:
-            with open(os.path.join(data_dir, terrain_file)) as f:
-                terrain_data = json.load(f)
+            terrain_data = load_terrain(os.path.join(data_dir, terrain_file))
         else:
             terrain_data = []
         # Parsing storm properties
@@ -95,8 +132,9 @@ def create_wind_scenarios(scenario_info, event_info, stations, data_dir):
             param.append(scenario_info['Storm']['Landfall']['Pressure'])
             param.append(scenario_info['Storm']['Landfall']['Speed'])
             param.append(scenario_info['Storm']['Landfall']['Radius'])
-        except:
+        except (KeyError, TypeError):
             print('CreateScenario: please provide all needed landfall properties.')
+            return 1
         # Monte-Carlo
         #del_par = [0, 0, 0] # default
         # Parsing mesh configurations
@@ -104,140 +142,126 @@ def create_wind_scenarios(scenario_info, event_info, stations, data_dir):
         mesh_info.extend([0., scenario_info['Mesh']['DivDeg'], 360.])
         # Wind speed measuring height
         measure_height = event_info['IntensityMeasure']['MeasureHeight']
-        # Saving results
-        scenario_data = dict()
-        for i in range(source_num):
-            scenario_data.update({i: {
-                'Type': 'Wind',
-                'CycloneParam': param,
-                'StormTrack': track,
-                'StormMesh': mesh_info,
-                'Terrain': terrain_data,
-                'TrackSimu': track_simu,
-                'StationList': station_list,
-                'MeasureHeight': measure_height
-            }})
+        # Saving results (scenarios share the same track/terrain/station data,
+        # only the top-level dict is copied per scenario)
+        scenario = {
+            'Type': 'Wind',
+            'CycloneParam': param,
+            'StormTrack': track,
+            'StormMesh': mesh_info,
+            'Terrain': terrain_data,
+            'TrackSimu': track_simu,
+            'StationList': station_list,
+            'MeasureHeight': measure_height
+        }
+        scenario_data = {i: dict(scenario) for i in range(source_num)}
         # return
         return scenario_data
 
     # Using the properties of a historical storm to do simulation
     elif scenario_info['Generator'] == 'SimulationHist':
         # Collecting site locations
-        lat = []
-        lon = []
-        for s in stations['Stations']:
-            lat.append(s['Latitude'])
-            lon.append(s['Longitude'])
+        df_st = pd.DataFrame.from_records(stations['Stations'], columns = ['Latitude', 'Longitude'])
         # Station list
         station_list = {
-            'Latitude': lat,
-            'Longitude': lon
+            'Latitude': df_st['Latitude'].tolist(),
+            'Longitude': df_st['Longitude'].tolist()
         }
         # Loading historical storm database
-        df_hs = pd.read_csv(os.path.join(os.path.dirname(__file__), 
-            'database/historical_storm/ibtracs.last3years.list.v04r00.csv'),
-            header = [0,1], index_col = None)
+        df_hs = load_hist_storm_database(os.path.join(os.path.dirname(__file__),
+            'database/historical_storm/ibtracs.last3years.list.v04r00.csv'))
         # Storm name and year
         try:
             storm_name = scenario_info['Storm'].get('Name')
             storm_year = scenario_info['Storm'].get('Year')
-        except:
+        except (KeyError, AttributeError):
             print('CreateScenario: error - no storm name or year is provided.')
+            return 1
         # Searching the storm
         try:
-            df_chs = df_hs[df_hs[('NAME', ' ')] == storm_name]
-            df_chs = df_chs[df_chs[('SEASON', 'Year')] == storm_year]
-        except:
-            print('CreateScenario: error - the storm is not found.')
-        if len(df_chs.values) == 0:
+            df_chs = df_hs.loc[[(storm_name, storm_year)]]
+        except KeyError:
             print('CreateScenario: error - the storm is not found.')
             return 1
+        # Casting the used storm properties to numeric arrays once (blank
+        # entries in the database become NaN)
+        props = {name: pd.to_numeric(df_chs[key], errors = 'coerce').to_numpy(dtype = float) for name, key in [
+            ('usa_lat', ('USA_LAT', 'degrees_north')), ('usa_lon', ('USA_LON', 'degrees_east')),
+            ('lat', ('LAT', 'degrees_north')), ('lon', ('LON', 'degrees_east')),
+            ('dist2land', ('DIST2LAND', 'km')), ('storm_dir', ('STORM_DIR', 'degrees')),
+            ('usa_pres', ('USA_PRES', 'mb')), ('storm_speed', ('STORM_SPEED', 'kts')),
+            ('usa_rmw', ('USA_RMW', 'nmile')), ('reunion_rmw', ('REUNION_RMW', 'nmile'))]}
         # Collecting storm properties
-        track_lat = []
-        track_lon = []
-        for x in df_chs[('USA_LAT', 'degrees_north')].values.tolist():
-            if x != ' ':
-                track_lat.append(float(x))
-        for x in df_chs[('USA_LON', 'degrees_east')].values.tolist():
-            if x != ' ':
-                track_lon.append(float(x))
+        track_lat = props['usa_lat'][~np.isnan(props['usa_lat'])]
+        track_lon = props['usa_lon'][~np.isnan(props['usa_lon'])]
         # If the default option (USA_LAT and USA_LON) is not available, swithcing to LAT and LON
         if len(track_lat) == 0:
             print('CreateScenario: warning - the USA_LAT and USA_LON are not available, switching to LAT and LON.')
-            for x in df_chs[('LAT', 'degrees_north')].values.tolist():
-                if x != ' ':
-                    track_lat.append(float(x))
-            for x in df_chs[('LON', 'degrees_east')].values.tolist():
-                if x != ' ':
-                    track_lon.append(float(x))
+            track_lat = props['lat'][~np.isnan(props['lat'])]
+            track_lon = props['lon'][~np.isnan(props['lon'])]
         if len(track_lat) == 0:
             print('CreateScenario: error - no track data is found.')
             return 1
-        # Saving the track
+        # Saving the track (as lists for the json-based model inputs)
         track = {
-            'Latitude': track_lat,
-            'Longitude': track_lon
+            'Latitude': track_lat.tolist(),
+            'Longitude': track_lon.tolist()
         }
         # Reading Terrain info (if provided)
         terrain_file = scenario_info.get('Terrain', None)
         if terrain_file:
-            with open(os.path.join(data_dir, terrain_file)) as f:
-                terrain_data = json.load(f)
+            terrain_data = load_terrain(os.path.join(data_dir, terrain_file))
         else:
             terrain_data = []
         # Storm characteristics at the landfall
-        dist2land = []
-        for x in df_chs[('DIST2LAND', 'km')]:
-            if x != ' ':
-                dist2land.append(x)
-        if len(track_lat) == 0:
+        dist2land = props['dist2land']
+        if np.all(np.isnan(dist2land)):
             print('CreateScenario: error - no landing information is found.')
             return 1
-        if (0 not in dist2land):
+        landing_loc = np.flatnonzero(dist2land == 0)
+        if landing_loc.size == 0:
             print('CreateScenario: warning - no landing fall is found, using the closest location.')
-            tmploc = dist2land.index(min(dist2land))
+            tmploc = int(np.nanargmin(dist2land))
         else:
-            tmploc = dist2land.index(0) # the first landing point in case the storm sway back and forth
+            tmploc = int(landing_loc[0]) # the first landing point in case the storm sway back and forth
         # simulation track
         track_simu_file = scenario_info['Storm'].get('TrackSimu', None)
         if track_simu_file:         
             try:
                 df = pd.read_csv(os.path.join(data_dir, track_simu_file), header = None, index_col = None)
-                track_simu = df.iloc[:, 0].values.tolist()
-            except:
+                track_simu = df.iloc[:, 0].tolist()
+            except (OSError, ValueError):
                 print('CreateScenario: warning - TrackSimu file not found, using the full track.')
-                track_simu = track_lat
+                track_simu = track['Latitude']
         else:
             print('CreateScenario: warning - no truncation defined, using the full track.')
             #tmp = track_lat
             #track_simu = tmp[max(0, tmploc - 5): len(dist2land) - 1]
             #print(track_simu)
-            track_simu = track_lat
+            track_simu = track['Latitude']
         # Reading data
-        try:
-            landfall_lat = float(df_chs[('USA_LAT', 'degrees_north')].iloc[tmploc])
-            landfall_lon = float(df_chs[('USA_LON', 'degrees_east')].iloc[tmploc])
-        except:
+        landfall_lat = float(props['usa_lat'][tmploc])
+        landfall_lon = float(props['usa_lon'][tmploc])
+        if np.isnan(landfall_lat) or np.isnan(landfall_lon):
             # If the default option (USA_LAT and USA_LON) is not available, swithcing to LAT and LON
-            landfall_lat = float(df_chs[('LAT', 'degrees_north')].iloc[tmploc])
-            landfall_lon = float(df_chs[('LON', 'degrees_east')].iloc[tmploc])
-        try:
-            landfall_ang = float(df_chs[('STORM_DIR', 'degrees')].iloc[tmploc])
-        except:
+            landfall_lat = float(props['lat'][tmploc])
+            landfall_lon = float(props['lon'][tmploc])
+        landfall_ang = float(props['storm_dir'][tmploc])
+        if np.isnan(landfall_ang):
             print('CreateScenario: error - no landing angle is found.')
+            return 1
         if landfall_ang > 180.0:
             landfall_ang = landfall_ang - 360.0
-        landfall_prs = 1013.0 - np.min([float(x) for x in df_chs[('USA_PRES', 'mb')].iloc[tmploc - 5: ].values.tolist() if x != ' '])
-        landfall_spd = float(df_chs[('STORM_SPEED', 'kts')].iloc[tmploc]) * 0.51444 # convert knots/s to km/s
-        try:
-            landfall_rad = float(df_chs[('USA_RMW', 'nmile')].iloc[tmploc]) * 1.60934 # convert nmile to km
-        except:
+        usa_pres = props['usa_pres'][tmploc - 5: ]
+        landfall_prs = 1013.0 - np.min(usa_pres[~np.isnan(usa_pres)])
+        landfall_spd = float(props['storm_speed'][tmploc]) * 0.51444 # convert knots/s to km/s
+        landfall_rad = float(props['usa_rmw'][tmploc]) * 1.60934 # convert nmile to km
+        if np.isnan(landfall_rad):
             # No available radius of maximum wind is found
             print('CreateScenario: warning - swithcing to REUNION_RMW.')
-            try:
-                # If the default option (USA_RMW) is not available, swithcing to REUNION_RMW
-                landfall_rad = float(df_chs[('REUNION_RMW', 'nmile')].iloc[tmploc]) * 1.60934 # convert nmile to km
-            except:
+            # If the default option (USA_RMW) is not available, swithcing to REUNION_RMW
+            landfall_rad = float(props['reunion_rmw'][tmploc]) * 1.60934 # convert nmile to km
+            if np.isnan(landfall_rad):
                 # No available radius of maximum wind is found
                 print('CreateScenario: warning - no available radius of maximum wind is found, using a default 50 km.')
                 landfall_rad = 50
@@ -255,19 +279,19 @@ def create_wind_scenarios(scenario_info, event_info, stations, data_dir):
         mesh_info.extend([0., scenario_info['Mesh']['DivDeg'], 360.])
         # Wind speed measuring height
         measure_height = event_info['IntensityMeasure']['MeasureHeight']
-        # Saving results
-        scenario_data = dict()
-        for i in range(source_num):
-            scenario_data.update({i: {
-                'Type': 'Wind',
-                'CycloneParam': param,
-                'StormTrack': track,
-                'StormMesh': mesh_info,
-                'Terrain': terrain_data,
-                'TrackSimu': track_simu,
-                'StationList': station_list,
-                'MeasureHeight': measure_height
-            }})
+        # Saving results (scenarios share the same track/terrain/station data,
+        # only the top-level dict is copied per scenario)
+        scenario = {
+            'Type': 'Wind',
+            'CycloneParam': param,
+            'StormTrack': track,
+            'StormMesh': mesh_info,
+            'Terrain': terrain_data,
+            'TrackSimu': track_simu,
+            'StationList': station_list,
+            'MeasureHeight': measure_height
+        }
+        scenario_data = {i: dict(scenario) for i in range(source_num)}
         # return
         return scenario_data
         
@@ -52,6 +52,7 @@
 
 import numpy as np
 from shapely.geometry import Point, Polygon
+from shapely.prepared import prep
 
 class LinearAnalyticalModel_SnaikiWu_2017:
 
@@ -114,6 +115,7 @@ class LinearAnalyticalModel_SnaikiWu_2017:
         }
         self.terrain_num = 0
         self.terrain_poly = []
+        self.terrain_prep = []
         self.terrain_z0 = []
         self.delta_path = np.zeros(3)
         self.r = []
@@ -157,8 +159,8 @@ class LinearAnalyticalModel_SnaikiWu_2017:
         else:
             #pt = Point(lat, lon)
             pt = Point(lon, lat)
-            for p, z in zip(self.terrain_poly, self.terrain_z0):
-                if pt.within(p):
+            for p, z in zip(self.terrain_prep, self.terrain_z0):
+                if p.contains(pt):
                     z0 = z
             if (not z0):
                 z0 = 0.01
@@ -176,6 +178,9 @@ class LinearAnalyticalModel_SnaikiWu_2017:
                 # creating a new polygon
                 new_poly = Polygon(p['geometry']['coordinates'][0])
                 self.terrain_poly.append(new_poly)
+                # prepared polygons speed up the repeated point-in-polygon
+                # tests in __interp_z0
+                self.terrain_prep.append(prep(new_poly))
                 self.terrain_z0.append(p['properties']['z0'])
                 self.terrain_num += 1
 
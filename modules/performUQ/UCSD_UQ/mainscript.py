@@ -7,12 +7,19 @@ affiliation: University of California, San Diego, *SimCenter, University of Cali
 # ======================================================================================================================
 import sys
 import json
+import importlib.util
 from pathlib import Path
 import shlex
 
-path_to_common_uq = Path(__file__).parent.parent / "common"
-sys.path.append(str(path_to_common_uq))
-import uq_utilities
+
+# ======================================================================================================================
+def _load_module(module_name, module_directory):
+    # Import the module from its file location without touching sys.path
+    spec = importlib.util.spec_from_file_location(module_name, module_directory / f"{module_name}.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
 
 
 # ======================================================================================================================
@@ -36,20 +43,17 @@ def main(input_args):
 
     uq_inputs = inputs["UQ"]
     if uq_inputs["uqType"] == "Metropolis Within Gibbs Sampler":
-        import mainscript_hierarchical_bayesian
-
-        main_function = mainscript_hierarchical_bayesian.main
+        module_name = "mainscript_hierarchical_bayesian"
     else:
-        import mainscript_tmcmc
-
-        main_function = mainscript_tmcmc.main
+        module_name = "mainscript_tmcmc"
+    main_function = _load_module(module_name, path_to_UCSD_UQ_directory).main
 
     command = (
         f'"{path_to_working_directory}" "{path_to_template_directory}" '
         f'{run_type} "{driver_file_name}" "{input_file_full_path}"'
     )
     command_list = shlex.split(command)
-    main_function(command_list)
+    main_function(command_list, inputs=inputs)
 
 
 # ======================================================================================================================
@@ -69,7 +69,7 @@ def loglikelihood_function(residual, error_variance_sample):
     return ll
 
 
-def main(input_args):
+def main(input_args, inputs=None):
     # Initialize analysis
     working_directory = Path(input_args[0]).resolve()
     template_directory = Path(input_args[1]).resolve()
@@ -79,8 +79,10 @@ def main(input_args):
 
     # input_file_full_path = template_directory / input_file
 
-    with open(input_file, 'r', encoding='utf-8') as f:
-        inputs = json.load(f)
+    # The input file is only parsed if the caller did not already do so
+    if inputs is None:
+        with open(input_file, 'r', encoding='utf-8') as f:
+            inputs = json.load(f)
 
     uq_inputs = inputs["UQ"]
     rv_inputs = inputs["randomVariables"]
@@ -96,7 +98,7 @@ def main(input_args):
         list_of_datasets,
         list_of_dataset_lengths,
         restart_file,
-    ) = preprocess_hierarchical_bayesian.preprocess_arguments(input_args)
+    ) = preprocess_hierarchical_bayesian.preprocess_arguments(input_args, inputs)
     transformation_function = joint_distribution.u_to_x
 
     prior_inverse_gamma_parameters = uq_utilities.InverseGammaParameters(
@@ -82,7 +82,7 @@ class TMCMC_Data:
 # ======================================================================================================================
 
 # ======================================================================================================================
-def main(input_args):
+def main(input_args, inputs=None):
     t1 = time.time()
 
     # Initialize analysis
@@ -120,7 +120,8 @@ def main(input_args):
     (number_of_samples, seed_value, calibration_data_filename, loglikelihood_module, write_outputs, variables_list, 
      edp_names_list, edp_lengths_list, models_dict, total_number_of_models_in_ensemble) = parseDataFunction(input_json_filename_full_path, 
                                                                                           logfile, working_directory, 
-                                                                                          os.path.dirname(mainscript_path))
+                                                                                          os.path.dirname(mainscript_path),
+                                                                                          jsonInputs=inputs)
     syncLogFile(logfile)
 
     # # ================================================================================================================
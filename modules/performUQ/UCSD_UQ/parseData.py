@@ -25,12 +25,13 @@ class DataProcessingError(Exception):
         self.message = message
 
 
-def parseDataFunction(dakotaJsonFile, logFile, tmpSimCenterDir, mainscriptDir):
-    # Read in the json object
-    logFile.write("\n\tReading the json file")
-    with open(dakotaJsonFile, "r") as f:
-        jsonInputs = json.load(f)
-    logFile.write(" ... Done")
+def parseDataFunction(dakotaJsonFile, logFile, tmpSimCenterDir, mainscriptDir, jsonInputs=None):
+    # Read in the json object (unless it was already parsed by the caller)
+    if jsonInputs is None:
+        logFile.write("\n\tReading the json file")
+        with open(dakotaJsonFile, "r") as f:
+            jsonInputs = json.load(f)
+        logFile.write(" ... Done")
 
     # Read in the data of the objects within the json file
     logFile.write("\n\tParsing the inputs read in from json file")
@@ -30,14 +30,16 @@ class CommandLineArguments:
 
 def _handle_arguments(
     command_line_arguments: CommandLineArguments,
+    inputs: Union[dict, None] = None,
 ) -> InputsType:
     working_directory_path = command_line_arguments.working_directory_path
     template_directory_path = command_line_arguments.template_directory_path
     run_type = command_line_arguments.run_type
     driver_file = command_line_arguments.driver_file
     input_file = command_line_arguments.input_file
-    with open(input_file, "r") as f:
-        inputs = json.load(f)
+    if inputs is None:
+        with open(input_file, "r") as f:
+            inputs = json.load(f)
     return (
         working_directory_path,
         template_directory_path,
@@ -206,16 +208,16 @@ def main(arguments: InputsType):
     )
 
 
-def _parse_arguments(args) -> InputsType:
+def _parse_arguments(args, inputs: Union[dict, None] = None) -> InputsType:
     parser = _create_parser()
     command_line_arguments = CommandLineArguments()
     parser.parse_args(args=args, namespace=command_line_arguments)
-    arguments = _handle_arguments(command_line_arguments)
+    arguments = _handle_arguments(command_line_arguments, inputs)
     return arguments
 
 
-def preprocess_arguments(args):
-    arguments = _parse_arguments(args)
+def preprocess_arguments(args, inputs: Union[dict, None] = None):
+    arguments = _parse_arguments(args, inputs)
     return main(arguments=arguments)
 
 